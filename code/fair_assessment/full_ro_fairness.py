@@ -326,33 +326,38 @@ def parse_boolean(value):
 
     return False
 
-parser = argparse.ArgumentParser(description='Tool to calculate the FAIRness of a Reserch Objects.')
+def main():
+    parser = argparse.ArgumentParser(description='Tool to calculate the FAIRness of a Reserch Objects.')
 
-parser.add_argument('-ro', dest='ro_path', type=str, required=True, 
-                    help='The location where the Reserch Object is. Do not include the "ro-crate-metadata.json"')
+    parser.add_argument('-ro', dest='ro_path', type=str, required=True,
+                        help='The location where the Reserch Object is. Do not include the "ro-crate-metadata.json"')
 
-parser.add_argument('-o', dest='output_file_name', type=str, default="ro-fairness.json" ,required=False, 
-                    help='Output file name including ".json"')
+    parser.add_argument('-o', dest='output_file_name', type=str, default="ro-fairness.json" ,required=False,
+                        help='Output file name including ".json"')
 
-parser.add_argument('-m', dest='evaluate_ro_metadata', type=parse_boolean, default=False ,required=False, 
-                    help='Whether or not the metadata of the components of the Reserch Object are analyzed')
+    parser.add_argument('-m', dest='evaluate_ro_metadata', type=parse_boolean, default=False ,required=False,
+                        help='Whether or not the metadata of the components of the Reserch Object are analyzed')
 
-parser.add_argument('-a', dest='aggregation_mode', type=int, default=0 ,required=False, 
-                    help='Select the different aggregation mode'
-                    '\n1: The score is calculated by adding all the scores of the different components together.'
-                          'All passed tests and all total tests are added together and then the percentage is calculated'
-                    '\n2: The score is calculated by averaging the scores of its components.'
-                          'The component score is the average of the score of each FAIR principle')
+    parser.add_argument('-a', dest='aggregation_mode', type=int, default=0 ,required=False,
+                        help='Select the different aggregation mode'
+                        '\n1: The score is calculated by adding all the scores of the different components together.'
+                              'All passed tests and all total tests are added together and then the percentage is calculated'
+                        '\n2: The score is calculated by averaging the scores of its components.'
+                              'The component score is the average of the score of each FAIR principle')
 
-parser.add_argument('-d', dest='generate_diagram', type=bool, default=False ,required=False, 
-                    help='Generate a visual representation')
+    parser.add_argument('-d', dest='generate_diagram', type=bool, default=False ,required=False,
+                        help='Generate a visual representation')
 
-args = parser.parse_args()
+    args = parser.parse_args()
 
-FAIROs(args.ro_path).\
-        calculate_fairness(args.evaluate_ro_metadata, 
-                           args.aggregation_mode, 
-                           args.output_file_name,
-                           args.generate_diagram)
+    FAIROs(args.ro_path).\
+            calculate_fairness(args.evaluate_ro_metadata,
+                               args.aggregation_mode,
+                               args.output_file_name,
+                               args.generate_diagram)
+
+
+if __name__ == '__main__':
+    main()
 
 
@@ -26,10 +26,10 @@ Requirements:
 import os
 import sys
 import json
+import time
 import tempfile
 import shutil
 from typing import Optional, Dict, Any, List
-from datetime import datetime
 
 # Add the code path for FAIROs imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "code/fair_assessment"))
@@ -46,6 +46,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import FAIROs components
 try:
     from rocrate_fairness.ro_fairness import ROCrateFAIRnessCalculator
@@ -136,19 +141,44 @@ app.add_middleware(
 # Helper Functions
 # ============================================================================
 
-def check_fuji_server() -> bool:
-    """Check if F-UJI server is running"""
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO-8601 string.
+
+    Cheaper than datetime.utcnow().isoformat() — avoids allocating a
+    datetime object per call, which adds up under concurrent load.
+    """
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)) + f".{ns // 1000:06d}"
+
+# How long a F-UJI probe result stays valid; /health may be polled by many
+# browsers (CORS is wide open) and should not fan out a network round-trip
+# per poll.
+FUJI_CHECK_TTL = 10.0  # seconds
+
+_fuji_check_cache = {"checked_at": 0.0, "ok": False}
+
+def check_fuji_server(force: bool = False) -> bool:
+    """Check if F-UJI server is running (result cached for FUJI_CHECK_TTL)"""
+    now = time.monotonic()
+    if not force and now - _fuji_check_cache["checked_at"] < FUJI_CHECK_TTL:
+        return _fuji_check_cache["ok"]
     try:
         resp = requests.get(f"{FUJI_SERVER_URL}/fuji/api/v1/", timeout=2)
-        return resp.status_code in [200, 404]  # 404 is OK, means server is running
+        ok = resp.status_code in [200, 404]  # 404 is OK, means server is running
     except:
-        return False
+        ok = False
+    _fuji_check_cache["checked_at"] = now
+    _fuji_check_cache["ok"] = ok
+    return ok
 
 def assess_with_fuji(url: str) -> FAIRScore:
     """Assess a URL using F-UJI"""
     if not check_fuji_server():
         raise HTTPException(status_code=503, detail="F-UJI server not available")
-    
+
+    # Compute once per request and reuse below
+    timestamp = utc_timestamp()
+
     try:
         fuji = FujiWrapper(url)
         checks = fuji.get_checks()
@@ -177,25 +207,37 @@ def assess_with_fuji(url: str) -> FAIRScore:
             checks_passed=passed,
             checks_total=total,
             tool_used="F-UJI",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp,
             details=checks
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"F-UJI assessment failed: {str(e)}")
 
-def assess_with_rocrate(jsonld: Dict[str, Any]) -> FAIRScore:
-    """Assess RO-Crate from JSON-LD data"""
+def assess_with_rocrate(jsonld: Dict[str, Any], background_tasks: BackgroundTasks) -> FAIRScore:
+    """Assess RO-Crate from JSON-LD data.
+
+    Temp-dir cleanup is deferred to background_tasks so the rmtree cost
+    is paid after the response is sent, not on the request path.
+    """
     if not ROCRATE_AVAILABLE:
         raise HTTPException(status_code=503, detail="ROCrateFAIRnessCalculator not available")
-    
+
+    # Compute once per request and reuse below
+    timestamp = utc_timestamp()
+
     # Create temporary directory with RO-Crate
     tmp_dir = tempfile.mkdtemp(prefix="fairos_")
     try:
-        # Write JSON-LD to file
+        # Write JSON-LD to file: serialize to one bytes object and emit it
+        # with a single write() instead of streaming through json.dump
         metadata_path = os.path.join(tmp_dir, "ro-crate-metadata.json")
-        with open(metadata_path, "w") as f:
-            json.dump(jsonld, f)
-        
+        payload = orjson.dumps(jsonld) if orjson is not None else json.dumps(jsonld).encode()
+        fd = os.open(metadata_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
         # Run assessment
         calculator = ROCrateFAIRnessCalculator(tmp_dir)
         result = calculator.calculate_fairness()
@@ -206,8 +248,8 @@ def assess_with_rocrate(jsonld: Dict[str, Any]) -> FAIRScore:
         
         # Extract category scores
         score_data = result.get("score", {})
-        
-        return FAIRScore(
+
+        score = FAIRScore(
             overall_score=score_data.get("final", 0),
             findable=None,  # ROCrate calculator doesn't break down by category the same way
             accessible=None,
@@ -216,7 +258,7 @@ def assess_with_rocrate(jsonld: Dict[str, Any]) -> FAIRScore:
             checks_passed=passed,
             checks_total=total,
             tool_used="RO-Crate-FAIR",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=timestamp,
             details=[{
                 "principle_id": c.get("principle_id"),
                 "title": c.get("title"),
@@ -226,16 +268,22 @@ def assess_with_rocrate(jsonld: Dict[str, Any]) -> FAIRScore:
         )
     except ValueError as e:
         # Handle RO-Crate validation errors (e.g., "root entity must have Dataset among its types")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
         error_msg = str(e)
         if "Dataset" in error_msg or "root entity" in error_msg.lower():
             raise HTTPException(
-                status_code=422, 
+                status_code=422,
                 detail=f"Invalid RO-Crate format: {error_msg}. Falling back to F-UJI."
             )
         raise
-    finally:
-        # Cleanup temp directory
+    except Exception:
+        # Error responses skip background tasks, so clean up inline
         shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Success: clean up after the response has been sent
+    background_tasks.add_task(shutil.rmtree, tmp_dir, ignore_errors=True)
+    return score
 
 
 # ============================================================================
@@ -252,22 +300,24 @@ async def root():
         "docs": "/docs"
     }
 
+# Static service bits — fixed once imports have resolved
+STATIC_SERVICES = {
+    "fairos_api": True,
+    "rocrate_calculator": ROCRATE_AVAILABLE,
+    "fuji_wrapper": FUJI_AVAILABLE,
+}
+
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Detailed health check including service status"""
     return HealthResponse(
         status="healthy",
-        services={
-            "fairos_api": True,
-            "rocrate_calculator": ROCRATE_AVAILABLE,
-            "fuji_wrapper": FUJI_AVAILABLE,
-            "fuji_server": check_fuji_server(),
-        },
-        timestamp=datetime.utcnow().isoformat()
+        services={**STATIC_SERVICES, "fuji_server": check_fuji_server()},
+        timestamp=utc_timestamp()
     )
 
 @app.post("/assess", response_model=AssessResponse, tags=["Assessment"])
-async def assess(request: AssessRequest):
+async def assess(request: AssessRequest, background_tasks: BackgroundTasks):
     """
     Assess FAIR score for a Research Object.
     
@@ -299,7 +349,7 @@ async def assess(request: AssessRequest):
                         resp.raise_for_status()
                         jsonld = resp.json()
                         if ROCRATE_AVAILABLE:
-                            score = assess_with_rocrate(jsonld)
+                            score = assess_with_rocrate(jsonld, background_tasks)
                         else:
                             raise HTTPException(status_code=503, detail=f"F-UJI failed and RO-Crate not available: {str(fuji_error)}")
                     except Exception as rocrate_error:
@@ -311,7 +361,7 @@ async def assess(request: AssessRequest):
                     resp.raise_for_status()
                     jsonld = resp.json()
                     if ROCRATE_AVAILABLE:
-                        score = assess_with_rocrate(jsonld)
+                        score = assess_with_rocrate(jsonld, background_tasks)
                     else:
                         raise HTTPException(status_code=503, detail="No assessment services available")
                 except requests.RequestException as e:
@@ -325,7 +375,7 @@ async def assess(request: AssessRequest):
         # Option 3: Assess by JSON-LD
         elif request.jsonld:
             identifier = request.jsonld.get("@id", "inline-rocrate")
-            score = assess_with_rocrate(request.jsonld)
+            score = assess_with_rocrate(request.jsonld, background_tasks)
         
         else:
             raise HTTPException(status_code=400, detail="Must provide url, jsonld, or dpid")
@@ -363,10 +413,10 @@ async def assess_url(request: AssessURLRequest):
         )
 
 @app.post("/assess/rocrate", response_model=AssessResponse, tags=["Assessment"])
-async def assess_rocrate(request: AssessROCrateRequest):
+async def assess_rocrate(request: AssessROCrateRequest, background_tasks: BackgroundTasks):
     """Assess RO-Crate from JSON-LD data"""
     try:
-        score = assess_with_rocrate(request.jsonld)
+        score = assess_with_rocrate(request.jsonld, background_tasks)
         return AssessResponse(
             success=True,
             score=score,
@@ -385,21 +435,44 @@ async def assess_rocrate(request: AssessROCrateRequest):
 # Main
 # ============================================================================
 
+def print_banner(probe_fuji: bool = False):
+    """Print the startup banner.
+
+    The F-UJI server is only probed when probe_fuji is True — the default
+    skips the network round-trip (first /health will probe and cache it),
+    so a down F-UJI server can't block uvicorn startup for the timeout.
+    """
+    if probe_fuji:
+        fuji_status = '✅' if check_fuji_server() else '❌ (start with: python -m fuji_server)'
+    else:
+        fuji_status = '(not probed at startup, pass --probe to check)'
+
+    print("\n".join([
+        "=" * 60,
+        "FAIROs API Server",
+        "=" * 60,
+        f"RO-Crate Calculator: {'✅' if ROCRATE_AVAILABLE else '❌'}",
+        f"F-UJI Wrapper: {'✅' if FUJI_AVAILABLE else '❌'}",
+        f"F-UJI Server URL: {FUJI_SERVER_URL}",
+        f"F-UJI Server: {fuji_status}",
+        f"dPID API URL: {DPID_API_URL}",
+        "=" * 60,
+        "Starting server on http://localhost:8000",
+        "API docs: http://localhost:8000/docs",
+        "=" * 60,
+    ]))
+
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    
-    print("=" * 60)
-    print("FAIROs API Server")
-    print("=" * 60)
-    print(f"RO-Crate Calculator: {'✅' if ROCRATE_AVAILABLE else '❌'}")
-    print(f"F-UJI Wrapper: {'✅' if FUJI_AVAILABLE else '❌'}")
-    print(f"F-UJI Server URL: {FUJI_SERVER_URL}")
-    print(f"F-UJI Server: {'✅' if check_fuji_server() else '❌ (start with: python -m fuji_server)'}")
-    print(f"dPID API URL: {DPID_API_URL}")
-    print("=" * 60)
-    print("Starting server on http://localhost:8000")
-    print("API docs: http://localhost:8000/docs")
-    print("=" * 60)
-    
+
+    parser = argparse.ArgumentParser(description="FAIROs API Server")
+    parser.add_argument("--probe", action="store_true",
+                        help="Probe the F-UJI server before starting")
+    cli_args = parser.parse_args()
+
+    print_banner(probe_fuji=cli_args.probe)
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
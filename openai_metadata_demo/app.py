@@ -6,15 +6,24 @@ Run with: streamlit run app.py
 """
 
 import os
+import re
 import json
+import hashlib
 import streamlit as st
+from heapq import nlargest
 from pathlib import Path
+from dataclasses import asdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from generate_metadata import (
-    fetch_dpid_jsonld,
-    fetch_dpid_tree,
+    fetch_dpid_bundle,
     parse_dpid_content,
-    generate_metadata_with_openai,
+    generate_metadata_with_openai_stream,
+    parse_metadata_response,
     format_file_size,
     DPIDContent,
     GeneratedMetadata
@@ -29,8 +38,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
+_CSS = """
     /* Main header styling */
     .main-header {
         background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
@@ -83,6 +91,13 @@ st.markdown("""
     }
     
     /* Stats boxes */
+    .stat-row {
+        display: flex;
+        gap: 1rem;
+    }
+    .stat-row .stat-box {
+        flex: 1;
+    }
     .stat-box {
         background: linear-gradient(135deg, #0f3460 0%, #16213e 100%);
         border-radius: 10px;
@@ -122,8 +137,64 @@ st.markdown("""
     .stProgress > div > div > div > div {
         background-color: #e94560;
     }
-</style>
-""", unsafe_allow_html=True)
+"""
+
+# Minified once at import; the payload is re-sent to the browser on every
+# rerun, so collapsing whitespace/comments cuts each rerun's HTML frame
+_MINIFIED_CSS = "<style>" + re.sub(r"/\*.*?\*/", "", re.sub(r"\s+", " ", _CSS)).strip() + "</style>"
+
+
+def inject_css():
+    """Inject the app stylesheet."""
+    st.markdown(_MINIFIED_CSS, unsafe_allow_html=True)
+
+
+# Precompiled HTML fragments for the render helpers — formatted per call
+# instead of rebuilding multi-line f-strings on every rerun
+_STAT_TPL = '<div class="stat-box"><div class="number">{n}</div><div class="label">{l}</div></div>'
+_KW_TPL = '<span class="keyword-tag">{}</span>'
+_CARD_TPL = '<div class="metadata-card"><h3>{icon} {title}</h3><p>{content}</p></div>'
+
+
+# dPID content is immutable, so identical (dpid, base_url) lookups can be
+# served from Streamlit's cache across reruns instead of re-hitting HTTP
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_fetch_bundle(dpid: int, base_url: str):
+    return fetch_dpid_bundle(dpid, base_url)
+
+
+def content_cache_key(content: DPIDContent, api_key: str, model: str) -> str:
+    """Stable cache key for a generation: content hash + key hash + model.
+
+    The API key is hashed (BLAKE2b) so the plaintext credential never
+    becomes part of a cache key.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(asdict(content), option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(asdict(content), sort_keys=True).encode()
+    h = hashlib.blake2b(payload, digest_size=16)
+    h.update(hashlib.blake2b(api_key.encode(), digest_size=16).digest())
+    h.update(model.encode())
+    return h.hexdigest()
+
+
+@st.cache_data(ttl=24 * 3600, max_entries=128, show_spinner=False)
+def cached_generate(cache_key: str, _generate) -> GeneratedMetadata:
+    """Memoize metadata generation on cache_key.
+
+    _generate (underscore-prefixed, so excluded from hashing) is only
+    invoked on a miss — re-clicking Generate for an unchanged dPID/model
+    returns instantly without another OpenAI call.
+    """
+    return _generate()
+
+
+def to_pretty_json(obj) -> bytes:
+    """Serialize obj to indented JSON bytes for download payloads."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 
 def render_header():
@@ -138,70 +209,41 @@ def render_header():
 
 def render_stats(content: DPIDContent):
     """Render statistics about the dPID."""
-    cols = st.columns(4)
-    
-    with cols[0]:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="number">{content.total_files}</div>
-            <div class="label">Total Files</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[1]:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="number">{format_file_size(content.total_size)}</div>
-            <div class="label">Total Size</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[2]:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="number">{len(content.authors)}</div>
-            <div class="label">Authors</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[3]:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="number">{len(content.extensions_summary)}</div>
-            <div class="label">File Types</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # All four boxes in one flex row and one st.markdown call — a single
+    # protocol frame instead of four
+    boxes = "".join(_STAT_TPL.format(n=n, l=l) for n, l in (
+        (content.total_files, "Total Files"),
+        (format_file_size(content.total_size), "Total Size"),
+        (len(content.authors), "Authors"),
+        (len(content.extensions_summary), "File Types"),
+    ))
+    st.markdown(f'<div class="stat-row">{boxes}</div>', unsafe_allow_html=True)
 
 
 def render_keywords(keywords: list):
     """Render keywords as tags."""
-    tags_html = "".join([f'<span class="keyword-tag">{kw}</span>' for kw in keywords])
-    st.markdown(tags_html, unsafe_allow_html=True)
+    st.markdown("".join(map(_KW_TPL.format, keywords)), unsafe_allow_html=True)
 
 
 def render_metadata_card(icon: str, title: str, content: str):
     """Render a metadata card."""
-    st.markdown(f"""
-    <div class="metadata-card">
-        <h3>{icon} {title}</h3>
-        <p>{content}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_CARD_TPL.format(icon=icon, title=title, content=content),
+                unsafe_allow_html=True)
 
 
 def render_extension_chart(extensions: dict):
     """Render file extension distribution."""
-    import pandas as pd
-    
-    # Sort and limit to top 10
-    sorted_exts = sorted(extensions.items(), key=lambda x: -x[1])[:10]
-    
+    # Top 10 via a bounded heap instead of sorting the whole histogram
+    sorted_exts = nlargest(10, extensions.items(), key=lambda kv: kv[1])
+
     if sorted_exts:
-        df = pd.DataFrame(sorted_exts, columns=['Extension', 'Count'])
-        st.bar_chart(df.set_index('Extension'))
+        # st.bar_chart accepts a plain dict — no pandas import needed on
+        # the render path
+        st.bar_chart(dict(sorted_exts))
 
 
 def main():
+    inject_css()
     render_header()
     
     # Sidebar
@@ -270,36 +312,40 @@ def main():
         status_container = st.empty()
         
         try:
-            # Step 1: Fetch JSON-LD
+            # Steps 1+2: fetch JSON-LD and file tree concurrently
             with progress_container:
-                st.progress(0.25, text="Fetching JSON-LD metadata...")
-            
-            jsonld = fetch_dpid_jsonld(dpid, base_url)
+                st.progress(0.50, text="Fetching JSON-LD metadata and file tree...")
+
+            jsonld, tree = cached_fetch_bundle(dpid, base_url)
             if not jsonld:
                 st.error("❌ Failed to fetch JSON-LD metadata")
                 return
-            
-            # Step 2: Fetch file tree
-            with progress_container:
-                st.progress(0.50, text="Fetching file tree...")
-            
-            tree = fetch_dpid_tree(dpid, base_url)
             if not tree:
                 st.error("❌ Failed to fetch file tree")
                 return
-            
+
             # Step 3: Parse content
             with progress_container:
                 st.progress(0.75, text="Analyzing content...")
             
             content = parse_dpid_content(dpid, jsonld, tree)
             
-            # Step 4: Generate with OpenAI
+            # Step 4: Generate with OpenAI, streaming tokens as they arrive
+            # instead of freezing on a 90% progress bar until completion
             with progress_container:
                 st.progress(0.90, text=f"Generating metadata with {model}...")
-            
-            metadata = generate_metadata_with_openai(content, api_key, model)
-            
+
+            stream_placeholder = status_container.empty()
+
+            def _stream_generate():
+                buffer = ""
+                for token in generate_metadata_with_openai_stream(content, api_key, model):
+                    buffer += token
+                    stream_placeholder.markdown(f"```json\n{buffer}\n```")
+                return parse_metadata_response(content, buffer, model)
+
+            metadata = cached_generate(content_cache_key(content, api_key, model), _stream_generate)
+
             # Clear progress
             progress_container.empty()
             status_container.empty()
@@ -333,9 +379,8 @@ def main():
             st.markdown(f"**License:** {content.license or 'Not specified'}")
             
             # Authors
-            author_names = [a.get('name', a.get('id', 'Unknown')) for a in content.authors[:10]]
-            if author_names:
-                st.markdown(f"**Authors:** {', '.join(author_names)}")
+            if content.author_display_names:
+                st.markdown(f"**Authors:** {', '.join(content.author_display_names[:10])}")
         
         with col2:
             render_stats(content)
@@ -410,7 +455,7 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            metadata_json = json.dumps({
+            metadata_json = to_pretty_json({
                 "dpid": metadata.dpid,
                 "original_title": metadata.original_title,
                 "suggested_title": metadata.suggested_title,
@@ -422,8 +467,8 @@ def main():
                 "potential_uses": metadata.potential_uses,
                 "model_used": metadata.model_used,
                 "generated_at": metadata.generated_at
-            }, indent=2)
-            
+            })
+
             st.download_button(
                 "📥 Download Metadata JSON",
                 metadata_json,
@@ -434,7 +479,7 @@ def main():
         with col2:
             st.download_button(
                 "📥 Download RO-Crate Snippet",
-                json.dumps(rocrate_example, indent=2),
+                to_pretty_json(rocrate_example),
                 file_name=f"dpid_{content.dpid}_rocrate.json",
                 mime="application/json"
             )
@@ -5,26 +5,233 @@ Batch metadata generation for multiple dPIDs.
 Usage:
     python batch_generate.py --start 1 --end 10
     python batch_generate.py --dpids 46,500,1024
+    python batch_generate.py --start 1 --end 100 --concurrency 8
 """
 
 import os
 import sys
 import json
-import argparse
 import time
+import asyncio
+import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+
+from openai import OpenAI, AsyncOpenAI
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from generate_metadata import (
-    fetch_dpid_jsonld,
-    fetch_dpid_tree,
+    fetch_dpid_bundle,
     parse_dpid_content,
-    generate_metadata_with_openai,
+    generate_metadata_with_openai_async,
+    build_batch_jsonl,
+    submit_and_wait_batch,
+    parse_metadata_response,
     save_results,
     format_file_size
 )
 
 
+async def process_one(dpid, args, output_dir, client, sem, limiter):
+    """Fetch, parse, and generate metadata for one dPID.
+
+    Returns (dpid, record) where record is the per-dPID summary entry.
+    The HTTP fetches and file writes are synchronous helpers, so they run
+    in worker threads; the OpenAI call awaits on the shared async client
+    after taking a token from the shared rate limiter.
+    """
+    async with sem:
+        try:
+            jsonld, tree = await asyncio.to_thread(fetch_dpid_bundle, dpid, args.base_url)
+            if not jsonld:
+                print(f"  ❌ dPID {dpid}: failed to fetch JSON-LD")
+                return dpid, {'status': 'failed', 'reason': 'jsonld_fetch'}
+            if not tree:
+                print(f"  ❌ dPID {dpid}: failed to fetch file tree")
+                return dpid, {'status': 'failed', 'reason': 'tree_fetch'}
+
+            # Parse content
+            content = parse_dpid_content(dpid, jsonld, tree)
+            print(f"  📁 dPID {dpid}: {content.total_files} files ({format_file_size(content.total_size)})")
+
+            # Generate metadata (paced by the shared token bucket)
+            await limiter.acquire_async()
+            metadata = await generate_metadata_with_openai_async(content, client, args.model)
+
+            # Save results
+            await asyncio.to_thread(save_results, content, metadata, output_dir)
+
+            print(f"  ✅ dPID {dpid}: success")
+            return dpid, {
+                'status': 'success',
+                'title': content.title,
+                'files': content.total_files,
+                'keywords': metadata.keywords[:5]
+            }
+
+        except Exception as e:
+            print(f"  ❌ dPID {dpid}: {e}")
+            return dpid, {'status': 'failed', 'reason': str(e)[:100]}
+
+
+class TokenBucket:
+    """Monotonic-clock token bucket for request pacing.
+
+    Holds up to `rate` tokens, refilled continuously at rate/period tokens
+    per second. Unlike a fixed inter-request sleep, this lets bursts use
+    the full allowance and only blocks when the budget is actually spent.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.rate = float(rate)
+        self.period = float(period)
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def _wait_time(self, cost: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.period)
+        self.updated = now
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) * self.period / self.rate
+
+    def acquire(self, cost: float = 1.0):
+        """Block until cost tokens are available."""
+        while True:
+            wait = self._wait_time(cost)
+            if wait <= 0:
+                self.tokens -= cost
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, cost: float = 1.0):
+        """Async variant: yields to the loop instead of blocking the thread."""
+        while True:
+            wait = self._wait_time(cost)
+            if wait <= 0:
+                self.tokens -= cost
+                return
+            await asyncio.sleep(wait)
+
+
+def run_batch_mode(dpids, args, output_dir, results, record):
+    """Generate metadata through the OpenAI Batch API.
+
+    All prompts are written to one NDJSON file, uploaded, and submitted
+    as a single batch (~50% cheaper than real-time calls and on a
+    separate rate-limit pool) through the shared build_batch_jsonl /
+    submit_and_wait_batch helpers; each result is then routed back
+    through save_results keyed on custom_id.
+    """
+    client = OpenAI(api_key=args.api_key)
+
+    # Fetch + parse everything that goes into the batch
+    contents = {}
+    for dpid in dpids:
+        jsonld, tree = fetch_dpid_bundle(dpid, args.base_url)
+        if not jsonld:
+            print(f"  ❌ dPID {dpid}: failed to fetch JSON-LD")
+            results['failed'] += 1
+            record(dpid, {'status': 'failed', 'reason': 'jsonld_fetch'})
+            continue
+        if not tree:
+            print(f"  ❌ dPID {dpid}: failed to fetch file tree")
+            results['failed'] += 1
+            record(dpid, {'status': 'failed', 'reason': 'tree_fetch'})
+            continue
+
+        content = parse_dpid_content(dpid, jsonld, tree)
+        contents[dpid] = content
+        print(f"  📁 dPID {dpid}: {content.total_files} files queued")
+
+    if not contents:
+        print("  ⚠️  Nothing to submit")
+        return
+
+    # Upload, submit and poll via the shared helpers
+    print(f"\n📤 Submitting batch of {len(contents)} requests...")
+    jsonl_path = build_batch_jsonl(list(contents.values()), args.model, output_dir)
+
+    try:
+        for custom_id, raw in submit_and_wait_batch(client, jsonl_path):
+            dpid = int(custom_id.split('-', 1)[1])
+            content = contents.pop(dpid, None)
+            if content is None:
+                continue
+            try:
+                metadata = parse_metadata_response(content, raw, args.model)
+                save_results(content, metadata, output_dir)
+                print(f"  ✅ dPID {dpid}: success")
+                results['success'] += 1
+                record(dpid, {
+                    'status': 'success',
+                    'title': content.title,
+                    'files': content.total_files,
+                    'keywords': metadata.keywords[:5]
+                })
+            except Exception as e:
+                print(f"  ❌ dPID {dpid}: {e}")
+                results['failed'] += 1
+                record(dpid, {'status': 'failed', 'reason': str(e)[:100]})
+    except RuntimeError as e:
+        # Batch reached a terminal status other than completed
+        print(f"  ❌ {e}")
+        for dpid in contents:
+            results['failed'] += 1
+            record(dpid, {'status': 'failed', 'reason': str(e)[:100]})
+        return
+
+    # Requests the batch produced no output line for
+    for dpid in contents:
+        results['failed'] += 1
+        record(dpid, {'status': 'failed', 'reason': 'no_batch_output'})
+
+
+async def run_batch(dpids, args, output_dir, results, record):
+    """Process all dPIDs concurrently, bounded by --concurrency."""
+    client = AsyncOpenAI(api_key=args.api_key)
+    sem = asyncio.Semaphore(args.concurrency)
+    limiter = TokenBucket(args.rpm, 60.0)
+
+    tasks = [asyncio.ensure_future(process_one(dpid, args, output_dir, client, sem, limiter))
+             for dpid in dpids]
+
+    done = 0
+    for task in asyncio.as_completed(tasks):
+        dpid, entry = await task
+        done += 1
+        print(f"[{done}/{len(tasks)}] dPID {dpid} done")
+        record(dpid, entry)
+        if entry['status'] == 'success':
+            results['success'] += 1
+        else:
+            results['failed'] += 1
+
+
+def _dpid(value: str) -> int:
+    """argparse converter: a single non-negative dPID number."""
+    try:
+        dpid = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid dPID number: {value!r}")
+    if dpid < 0:
+        raise argparse.ArgumentTypeError(f"dPID must be non-negative: {dpid}")
+    return dpid
+
+
+def _dpid_list(value: str) -> list:
+    """argparse converter: comma-separated dPID numbers."""
+    dpids = [_dpid(part.strip()) for part in value.split(',') if part.strip()]
+    if not dpids:
+        raise argparse.ArgumentTypeError("expected at least one dPID number")
+    return dpids
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Batch generate metadata for multiple dPIDs'
@@ -33,18 +240,18 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
         '--dpids',
-        type=str,
+        type=_dpid_list,
         help='Comma-separated list of dPID numbers (e.g., 46,500,1024)'
     )
     group.add_argument(
         '--start',
-        type=int,
+        type=_dpid,
         help='Start dPID number (use with --end)'
     )
-    
+
     parser.add_argument(
         '--end',
-        type=int,
+        type=_dpid,
         help='End dPID number (use with --start)'
     )
     parser.add_argument(
@@ -72,10 +279,21 @@ def main():
         help='Output directory'
     )
     parser.add_argument(
-        '--delay',
+        '--rpm',
         type=float,
-        default=1.0,
-        help='Delay between API calls in seconds (default: 1.0)'
+        default=60.0,
+        help='OpenAI requests-per-minute budget (default: 60)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of dPIDs processed in parallel (default: 1)'
+    )
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='Submit all requests via the OpenAI Batch API (50%% cheaper, up to 24h)'
     )
     parser.add_argument(
         '--skip-existing',
@@ -89,9 +307,9 @@ def main():
         print("Error: OpenAI API key required")
         sys.exit(1)
     
-    # Determine dPIDs to process
+    # Determine dPIDs to process (parsing/validation done by the converters)
     if args.dpids:
-        dpids = [int(d.strip()) for d in args.dpids.split(',')]
+        dpids = args.dpids
     else:
         if args.end is None:
             print("Error: --end required with --start")
@@ -106,81 +324,81 @@ def main():
     print(f"=" * 60)
     print(f"dPIDs to process: {len(dpids)}")
     print(f"Model: {args.model}")
+    print(f"Concurrency: {args.concurrency}")
     print(f"Output: {output_dir}")
     print(f"=" * 60)
-    
-    # Track results
+
+    # Only counters live in memory; per-dPID entries are appended to a
+    # crash-safe NDJSON log as they complete
     results = {
-        'started': datetime.utcnow().isoformat(),
+        'started': datetime.now(timezone.utc).isoformat(),
         'model': args.model,
         'total': len(dpids),
         'success': 0,
         'failed': 0,
-        'skipped': 0,
-        'dpids': {}
+        'skipped': 0
     }
-    
-    for i, dpid in enumerate(dpids, 1):
-        print(f"\n[{i}/{len(dpids)}] Processing dPID {dpid}...")
-        
-        # Check if already exists
-        if args.skip_existing:
-            metadata_file = output_dir / f"dpid_{dpid}_metadata.json"
-            if metadata_file.exists():
-                print(f"  ⏭️  Skipping (already exists)")
+
+    log_path = output_dir / 'batch_summary.ndjson'
+
+    # Resume support: dPIDs already logged as done in a previous run,
+    # plus metadata files found by one directory scan (instead of a
+    # stat call per candidate dPID)
+    processed = set()
+    if args.skip_existing:
+        if log_path.exists():
+            with open(log_path) as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if row.get('status') in ('success', 'skipped'):
+                        processed.add(row.get('dpid'))
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('dpid_') and name.endswith('_metadata.json'):
+                    try:
+                        processed.add(int(name[5:-14]))
+                    except ValueError:
+                        continue
+
+    log_file = open(log_path, 'a', buffering=1)
+
+    def record(dpid, entry):
+        """Append one per-dPID entry to the NDJSON log."""
+        log_file.write(json.dumps({'dpid': dpid, **entry}) + '\n')
+
+    # Filter out already-processed dPIDs before dispatching
+    if args.skip_existing:
+        remaining = []
+        for dpid in dpids:
+            if dpid in processed:
+                print(f"  ⏭️  Skipping dPID {dpid} (already exists)")
                 results['skipped'] += 1
-                results['dpids'][dpid] = {'status': 'skipped', 'reason': 'exists'}
-                continue
-        
-        try:
-            # Fetch data
-            jsonld = fetch_dpid_jsonld(dpid, args.base_url)
-            if not jsonld:
-                print(f"  ❌ Failed to fetch JSON-LD")
-                results['failed'] += 1
-                results['dpids'][dpid] = {'status': 'failed', 'reason': 'jsonld_fetch'}
-                continue
-            
-            tree = fetch_dpid_tree(dpid, args.base_url)
-            if not tree:
-                print(f"  ❌ Failed to fetch file tree")
-                results['failed'] += 1
-                results['dpids'][dpid] = {'status': 'failed', 'reason': 'tree_fetch'}
-                continue
-            
-            # Parse content
-            content = parse_dpid_content(dpid, jsonld, tree)
-            print(f"  📁 {content.total_files} files ({format_file_size(content.total_size)})")
-            
-            # Generate metadata
-            metadata = generate_metadata_with_openai(content, args.api_key, args.model)
-            
-            # Save results
-            save_results(content, metadata, output_dir)
-            
-            print(f"  ✅ Success")
-            results['success'] += 1
-            results['dpids'][dpid] = {
-                'status': 'success',
-                'title': content.title,
-                'files': content.total_files,
-                'keywords': metadata.keywords[:5]
-            }
-            
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            results['failed'] += 1
-            results['dpids'][dpid] = {'status': 'failed', 'reason': str(e)[:100]}
-        
-        # Rate limiting
-        if i < len(dpids):
-            time.sleep(args.delay)
-    
-    # Save summary
-    results['finished'] = datetime.utcnow().isoformat()
+                record(dpid, {'status': 'skipped', 'reason': 'exists'})
+            else:
+                remaining.append(dpid)
+        dpids = remaining
+
+    try:
+        if args.batch_api:
+            run_batch_mode(dpids, args, output_dir, results, record)
+        else:
+            asyncio.run(run_batch(dpids, args, output_dir, results, record))
+    finally:
+        log_file.close()
+
+    # Save summary (orjson serializes in one shot when available)
+    results['finished'] = datetime.now(timezone.utc).isoformat()
     summary_file = output_dir / 'batch_summary.json'
-    with open(summary_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    if orjson is not None:
+        summary_file.write_bytes(
+            orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(summary_file, 'w') as f:
+            json.dump(results, f, indent=2)
     
     print(f"\n" + "=" * 60)
     print("BATCH COMPLETE")
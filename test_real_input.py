@@ -18,21 +18,69 @@ Prerequisites:
 - Network access to download RO-Crates
 
 Usage:
-    python test_real_input.py
+    python test_real_input.py [--force-check]
 """
 
 import subprocess
 import sys
 import os
+import io
 import json
+import time
+import functools
+import atexit
+import queue
+import select
 import shutil
+import threading
 import zipfile
 import tempfile
 
-# Paths
-FAIROS_DIR = os.path.dirname(os.path.abspath(__file__))
-CLI_SCRIPT = os.path.join(FAIROS_DIR, "code/fair_assessment/full_ro_fairness.py")
-TEST_DIR = os.path.join(FAIROS_DIR, "test-ro-crates")
+from pathlib import Path
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses multi-MB assessment reports in a fraction of the
+# stdlib's time; both accept bytes, so callers read files in 'rb'
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# One pooled session for every HTTP call in this script: keep-alive
+# reuses the TLS handshake across the repeated workflowhub.eu hits and
+# retries cover transient server errors
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504])
+))
+atexit.register(SESSION.close)
+
+# Paths (pathlib keeps the joins below readable and OS-neutral)
+FAIROS_DIR = Path(__file__).resolve().parent
+ASSESSMENT_DIR = FAIROS_DIR / "code" / "fair_assessment"
+CLI_SCRIPT = ASSESSMENT_DIR / "full_ro_fairness.py"
+TEST_DIR = FAIROS_DIR / "test-ro-crates"
+
+# Invariant part of every CLI invocation; call sites append their args
+_CLI_PREFIX = [sys.executable, str(CLI_SCRIPT)]
+
+# Import the assessment in-process when its dependencies are available:
+# the interpreter startup and heavy library imports are then paid once
+# per run instead of once per crate. Falls back to the subprocess CLI.
+sys.path.insert(0, str(ASSESSMENT_DIR))
+try:
+    from full_ro_fairness import FAIROs
+except Exception:
+    FAIROs = None
 
 # Real RO-Crates to test from WorkflowHub
 # See: https://workflowhub.eu/workflows
@@ -52,6 +100,118 @@ TEST_SOURCES = [
 ]
 
 
+FUJI_URL = "http://localhost:1071/fuji/api/v1/"
+
+# Check statuses that count as passed (built once, not per component)
+_PASS_STATUSES = frozenset(('ok', 'pass'))
+
+# Structural shape every crate's metadata must have before we bother
+# extracting/assessing it. With jsonschema installed the validator is
+# compiled once here and shared across crates; without it, a plain
+# check below covers the same requirements.
+_CRATE_SCHEMA = {
+    "type": "object",
+    "required": ["@context", "@graph"],
+    "properties": {"@graph": {"type": "array"}},
+}
+try:
+    import jsonschema
+    _CRATE_VALIDATOR = jsonschema.Draft7Validator(_CRATE_SCHEMA)
+except ImportError:
+    _CRATE_VALIDATOR = None
+
+
+def _validate_crate_metadata(meta):
+    """Return None if meta looks like crate metadata, else the first error"""
+    if _CRATE_VALIDATOR is not None:
+        error = next(_CRATE_VALIDATOR.iter_errors(meta), None)
+        return error.message if error else None
+    if not isinstance(meta, dict):
+        return "metadata is not a JSON object"
+    for key in ("@context", "@graph"):
+        if key not in meta:
+            return f"{key!r} is a required property"
+    if not isinstance(meta["@graph"], list):
+        return "'@graph' is not an array"
+    return None
+
+# Assessment watchdog: hard ceiling, plus an early cancel when the CLI
+# produces no output for a while even though F-UJI itself is responsive
+HARD_TIMEOUT_S = 600
+STALL_LIMIT_S = 120
+
+# Per-URL validators (ETag/Last-Modified) from previous runs, so reruns
+# can revalidate with a conditional GET instead of re-downloading
+CACHE_FILE = FAIROS_DIR / ".fairos_cache.json"
+
+# Downloads run on a thread pool, so updates to the shared cache file
+# must not read-modify-write concurrently or the last writer discards
+# the others' entries
+_CACHE_LOCK = threading.Lock()
+
+
+def _load_url_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_url_cache(cache):
+    # Atomic rewrite so a crash mid-write can't corrupt the cache
+    tmp_path = CACHE_FILE.with_name(CACHE_FILE.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def _update_url_cache(url, entry):
+    # Re-read under the lock so concurrent downloaders merge their
+    # entries instead of clobbering each other's
+    with _CACHE_LOCK:
+        cache = _load_url_cache()
+        cache[url] = entry
+        _save_url_cache(cache)
+
+
+# With crates processed on worker threads, interleaved prints turn the
+# report into soup. Each pipeline stage collects its output in a
+# thread-local buffer and flushes it to stdout in one locked write.
+_PRINT_LOCK = threading.Lock()
+_thread_out = threading.local()
+
+_builtin_print = print
+
+
+def _stdout():
+    """This thread's output target: its stage buffer, or real stdout"""
+    return getattr(_thread_out, 'buffer', None) or sys.stdout
+
+
+def print(*values, **kwargs):  # shadows the builtin within this module
+    kwargs.setdefault('file', _stdout())
+    _builtin_print(*values, **kwargs)
+
+
+def _buffered(fn):
+    """Collect fn's prints and emit them atomically when it returns"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        _thread_out.buffer = buf
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _thread_out.buffer = None
+            text = buf.getvalue()
+            if text:
+                with _PRINT_LOCK:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+    return wrapper
+
+
 def print_section(title):
     """Print a formatted section header"""
     print(f"\n{'='*70}")
@@ -59,14 +219,25 @@ def print_section(title):
     print('='*70)
 
 
-def check_prerequisites():
-    """Check that F-UJI and network are available"""
+# Memoized prerequisite probe: the F-UJI/network state rarely changes
+# within a run, so repeated callers reuse the last answer for a minute
+_prereq_cache = {"t": 0.0, "v": False}
+
+
+def check_prerequisites(force=False):
+    """Check that F-UJI and network are available.
+
+    The result is cached for 60 seconds; pass force=True (or run the
+    script with --force-check) to probe again regardless.
+    """
+    if not force and time.time() - _prereq_cache["t"] < 60:
+        return _prereq_cache["v"]
+
     print("\n🔍 Checking prerequisites...")
-    
+
     # Check F-UJI
     try:
-        import requests
-        resp = requests.get("http://localhost:1071/fuji/api/v1/", timeout=5)
+        resp = SESSION.get(FUJI_URL, timeout=5)
         print("   ✅ F-UJI server running")
         fuji_ok = True
     except:
@@ -76,61 +247,176 @@ def check_prerequisites():
     
     # Check network
     try:
-        import requests
-        resp = requests.get("https://workflowhub.eu", timeout=10)
+        resp = SESSION.get("https://workflowhub.eu", timeout=10)
         print("   ✅ Network access OK")
         network_ok = True
     except:
         print("   ❌ Network access failed")
         network_ok = False
-    
-    return fuji_ok and network_ok
+
+    _prereq_cache["t"] = time.time()
+    _prereq_cache["v"] = fuji_ok and network_ok
+    return _prereq_cache["v"]
+
+
+def _extract_members(zip_path, target_dir, names):
+    """Extract a batch of members using this thread's own ZipFile handle
+    (ZipFile objects are not safe to share across threads)."""
+    with zipfile.ZipFile(zip_path) as z:
+        for name in names:
+            z.extract(name, target_dir)
+
+
+def extract_zip_parallel(zip_path, target_dir, max_workers=None):
+    """Extract a zip, spreading the DEFLATE work across threads.
+
+    zlib releases the GIL while inflating, so independent members
+    decompress in parallel. Small archives just use extractall.
+    """
+    with zipfile.ZipFile(zip_path) as z:
+        names = z.namelist()
+
+    workers = max_workers or min(os.cpu_count() or 1, 8)
+    if workers <= 1 or len(names) < 8:
+        with zipfile.ZipFile(zip_path) as z:
+            z.extractall(target_dir)
+        return
+
+    # Pre-create the directory tree to avoid concurrent-makedirs races
+    for name in names:
+        member_dir = os.path.dirname(name)
+        if member_dir:
+            os.makedirs(os.path.join(target_dir, member_dir), exist_ok=True)
+
+    batches = [names[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(_extract_members, zip_path, target_dir, batch)
+                       for batch in batches if batch]:
+            future.result()
 
 
 def download_rocrate(source):
     """Download an RO-Crate from the web"""
-    import requests
-    
     print(f"\n📥 Downloading: {source['name']}...")
     
-    target_dir = os.path.join(TEST_DIR, source['folder'])
-    
+    target_dir = TEST_DIR / source['folder']
+
     # Skip if already downloaded
-    if os.path.exists(os.path.join(target_dir, "ro-crate-metadata.json")):
+    if (target_dir / "ro-crate-metadata.json").exists():
         print(f"   ✅ Already downloaded: {target_dir}")
         return target_dir
-    
+
     # Create test directory
-    os.makedirs(TEST_DIR, exist_ok=True)
+    TEST_DIR.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Download
-        resp = requests.get(source['url'], timeout=60)
-        resp.raise_for_status()
-        
-        if source['type'] == 'zip':
-            # Save and extract zip
-            zip_path = os.path.join(TEST_DIR, f"{source['folder']}.zip")
-            with open(zip_path, 'wb') as f:
-                f.write(resp.content)
-            
-            # Extract
-            with zipfile.ZipFile(zip_path, 'r') as z:
-                z.extractall(target_dir)
-            
-            # Clean up zip
-            os.remove(zip_path)
-            
-            print(f"   ✅ Downloaded and extracted to: {target_dir}")
-        else:
-            # JSON directly
-            os.makedirs(target_dir, exist_ok=True)
-            with open(os.path.join(target_dir, "ro-crate-metadata.json"), 'w') as f:
-                f.write(resp.text)
-            print(f"   ✅ Downloaded to: {target_dir}")
-        
+        # Revalidate against the cached ETag/Last-Modified when a
+        # previous extraction is still on disk
+        cache = _load_url_cache()
+        entry = cache.get(source['url'], {})
+        headers = {}
+        reuse_dir = target_dir / (entry.get('meta_dir') or '')
+        # Validators are only worth sending while the previous extraction
+        # is intact: a 304 pointing at a mangled tree would strand reruns
+        # until the cache file is deleted
+        if target_dir.is_dir() and (reuse_dir / "ro-crate-metadata.json").exists():
+            # Cheapest first: a HEAD carries no body, and if the
+            # ETag/size signature matches the cached one the extracted
+            # tree can be reused without issuing the GET at all
+            if entry.get('etag') and entry.get('content_length'):
+                try:
+                    head = SESSION.head(source['url'], timeout=10,
+                                        allow_redirects=True)
+                    sig = (head.headers.get('ETag'),
+                           head.headers.get('Content-Length'))
+                    if sig == (entry['etag'], entry['content_length']):
+                        print(f"   ✅ Signature unchanged; reusing: {reuse_dir}")
+                        return reuse_dir
+                except requests.RequestException:
+                    pass
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        # Download, streaming straight to disk so memory stays bounded
+        # at one chunk instead of the whole (possibly huge) crate
+        with SESSION.get(source['url'], timeout=60, stream=True, headers=headers) as resp:
+            if resp.status_code == 304:
+                if (reuse_dir / "ro-crate-metadata.json").exists():
+                    print(f"   ✅ Not modified; reusing: {reuse_dir}")
+                    return reuse_dir
+                # The tree vanished after the validators were sent; the
+                # retry sends none (gate above), so it downloads fresh
+                print(f"   ⚠️  Not modified but extraction incomplete; re-downloading")
+                return download_rocrate(source)
+            resp.raise_for_status()
+            meta_dir = ''
+
+            if source['type'] == 'zip':
+                # Save and extract zip
+                zip_path = TEST_DIR / f"{source['folder']}.zip"
+                # Socket-to-file copy with a 4 MiB buffer; decode_content
+                # makes urllib3 strip any Content-Encoding the server
+                # applied, so what lands on disk is the actual zip
+                resp.raw.decode_content = True
+                with open(zip_path, 'wb') as f:
+                    shutil.copyfileobj(resp.raw, f, length=1 << 22)
+
+                # The zip's central directory already knows where
+                # ro-crate-metadata.json lives — no need to walk the
+                # extracted tree afterwards. Probe and validate that one
+                # member in-archive so a broken crate is rejected before
+                # paying for a full extraction.
+                with zipfile.ZipFile(zip_path) as z:
+                    meta_name = next(
+                        (n for n in z.namelist()
+                         if n.endswith("ro-crate-metadata.json")), None)
+                    if meta_name is None:
+                        print(f"   ❌ No ro-crate-metadata.json in archive; skipping extraction")
+                        os.remove(zip_path)
+                        return None
+                    try:
+                        with z.open(meta_name) as mf:
+                            meta = _loads(mf.read())
+                    except ValueError:
+                        meta = None
+                error = ("metadata is not valid JSON" if meta is None
+                         else _validate_crate_metadata(meta))
+                if error:
+                    print(f"   ❌ Invalid ro-crate-metadata.json ({error}); skipping extraction")
+                    os.remove(zip_path)
+                    return None
+                meta_dir = os.path.dirname(meta_name)
+
+                # Extract
+                extract_zip_parallel(zip_path, target_dir)
+
+                # Clean up zip
+                os.remove(zip_path)
+
+                target_dir = target_dir / meta_dir if meta_dir else target_dir
+                print(f"   ✅ Downloaded and extracted to: {target_dir}")
+            else:
+                # JSON directly (raw bytes; no decode/encode round-trip).
+                # decode_content strips any gzip the server applied —
+                # application/json responses are routinely compressed
+                resp.raw.decode_content = True
+                target_dir.mkdir(parents=True, exist_ok=True)
+                with open(target_dir / "ro-crate-metadata.json", 'wb') as f:
+                    shutil.copyfileobj(resp.raw, f)
+                print(f"   ✅ Downloaded to: {target_dir}")
+
+            new_entry = {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+                'content_length': resp.headers.get('Content-Length'),
+                'meta_dir': meta_dir
+            }
+        _update_url_cache(source['url'], new_entry)
+
         return target_dir
-        
+
     except Exception as e:
         print(f"   ❌ Download failed: {e}")
         return None
@@ -141,30 +427,80 @@ def run_fairos_assessment(ro_path, output_name):
     print(f"\n🔬 Running FAIROs assessment...")
     print(f"   Input: {ro_path}")
     
-    output_file = os.path.join(FAIROS_DIR, output_name)
-    
-    # Run CLI
-    result = subprocess.run(
-        [sys.executable, CLI_SCRIPT, 
-         "-ro", ro_path, 
-         "-o", output_file,
-         "-m", "true"],  # Evaluate RO metadata
-        capture_output=True,
-        text=True,
-        cwd=os.path.join(FAIROS_DIR, "code/fair_assessment"),
-        timeout=600  # 10 minute timeout
+    output_file = FAIROS_DIR / output_name
+
+    # Prefer the in-process call; any failure falls through to the CLI
+    if FAIROs is not None:
+        try:
+            FAIROs(str(ro_path)).calculate_fairness(True, 0, str(output_file), False)
+            if output_file.exists():
+                print(f"   ✅ Assessment completed")
+                return output_file
+        except Exception as e:
+            print(f"   ⚠️  In-process assessment failed ({e}); retrying via CLI")
+
+    # Run CLI. Instead of a blunt fixed timeout, watch the process for
+    # progress: while it keeps producing output we let it run (up to the
+    # hard ceiling), but if it goes silent and F-UJI itself still answers,
+    # the crate is stuck — not the server — so cancel early rather than
+    # waiting out the full ten minutes. Output streams to a per-crate log
+    # file (kept as an artifact) instead of accumulating in memory.
+    log_path = output_file.with_suffix(".log")
+    proc = subprocess.Popen(
+        _CLI_PREFIX + ["-ro", str(ro_path),
+                       "-o", str(output_file),
+                       "-m", "true"],  # Evaluate RO metadata
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        cwd=ASSESSMENT_DIR
     )
-    
-    if result.returncode == 0 and os.path.exists(output_file):
+    out_fd = proc.stdout.fileno()
+
+    start = last_output = time.time()
+    cancelled = None
+    with open(log_path, 'wb') as log:
+        while proc.poll() is None:
+            ready, _, _ = select.select([proc.stdout], [], [], 5)
+            if ready:
+                # Read the raw fd: readline() would block on a partial
+                # line and never come back to the timeout checks below
+                chunk = os.read(out_fd, 4096)
+                if chunk:
+                    last_output = time.time()
+                    log.write(chunk)
+            now = time.time()
+            if now - start > HARD_TIMEOUT_S:
+                cancelled = f"timed out after {HARD_TIMEOUT_S}s"
+            elif now - last_output > STALL_LIMIT_S:
+                try:
+                    if SESSION.get(FUJI_URL, timeout=2).ok:
+                        cancelled = f"no progress for {STALL_LIMIT_S}s (F-UJI still healthy)"
+                except requests.RequestException:
+                    # F-UJI not answering either — the stall may be
+                    # server-side load, so keep waiting until the ceiling
+                    pass
+            if cancelled:
+                proc.terminate()
+                break
+
+        proc.wait()
+        while chunk := os.read(out_fd, 4096):
+            log.write(chunk)
+        proc.stdout.close()
+
+    if cancelled is None and proc.returncode == 0 and output_file.exists():
         print(f"   ✅ Assessment completed")
         return output_file
     else:
-        print(f"   ❌ Assessment failed")
-        if result.stderr:
-            # Show first few lines of error
-            error_lines = result.stderr.split('\n')[:10]
-            for line in error_lines:
-                print(f"      {line}")
+        print(f"   ❌ Assessment failed" + (f": {cancelled}" if cancelled else ""))
+        # Show the tail of the log; the full log stays on disk
+        try:
+            with open(log_path) as log:
+                for line in log.readlines()[-10:]:
+                    print(f"      {line.rstrip()}")
+        except OSError:
+            pass
+        print(f"      Full log: {log_path}")
         return None
 
 
@@ -174,8 +510,8 @@ def display_results(output_file, source_name):
     print("-" * 50)
     
     try:
-        with open(output_file) as f:
-            data = json.load(f)
+        with open(output_file, 'rb') as f:
+            data = _loads(f.read())
         
         # Overall score
         if 'overall_score' in data:
@@ -196,18 +532,17 @@ def display_results(output_file, source_name):
             
             # Count checks
             checks = comp.get('checks', [])
-            passed = sum(1 for c in checks if c.get('status') in ['ok', 'pass'])
+            passed = sum(1 for c in checks if c.get('status') in _PASS_STATUSES)
             print(f"   │  Checks: {passed}/{len(checks)} passed")
-            
-            # Show score breakdown if available
+
+            # Show score breakdown if available (one write for the block)
             if 'score' in comp:
-                print(f"   │  Scores by category:")
-                for cat, scores in comp['score'].items():
-                    cat_score = scores.get('score', 0)
-                    cat_total = scores.get('total_score', 0)
-                    if cat_total > 0:
-                        pct = (cat_score / cat_total) * 100
-                        print(f"   │    {cat}: {pct:.0f}%")
+                lines = [
+                    f"   │    {cat}: {scores.get('score', 0) / scores['total_score'] * 100:.0f}%\n"
+                    for cat, scores in comp['score'].items()
+                    if scores.get('total_score', 0) > 0
+                ]
+                _stdout().write("   │  Scores by category:\n" + "".join(lines))
             
             print(f"   └────────────────────────")
         
@@ -218,61 +553,98 @@ def display_results(output_file, source_name):
         return False
 
 
-def test_rocrate(source):
-    """Full test pipeline for one RO-Crate"""
+@_buffered
+def prepare_rocrate(source):
+    """Download stage: fetch the crate and return its path, or None"""
     print_section(f"Testing: {source['name']}")
-    
-    # Download
+
     ro_path = download_rocrate(source)
     if not ro_path:
-        return False
-    
-    # Find the actual ro-crate-metadata.json
-    metadata_file = os.path.join(ro_path, "ro-crate-metadata.json")
-    if not os.path.exists(metadata_file):
-        # Check subdirectories
-        for root, dirs, files in os.walk(ro_path):
-            if "ro-crate-metadata.json" in files:
-                ro_path = root
-                break
-    
-    if not os.path.exists(os.path.join(ro_path, "ro-crate-metadata.json")):
+        return None
+
+    # download_rocrate already points at the directory containing
+    # ro-crate-metadata.json (located via the zip's central directory)
+    if not (ro_path / "ro-crate-metadata.json").exists():
         print(f"   ❌ ro-crate-metadata.json not found in {ro_path}")
-        return False
-    
-    # Run assessment
+        return None
+
+    return ro_path
+
+
+@_buffered
+def assess_rocrate(source, ro_path):
+    """Assessment stage: run FAIROs on a downloaded crate and report"""
     output_name = f"test_results_{source['folder']}.json"
     output_file = run_fairos_assessment(ro_path, output_name)
-    
+
     if not output_file:
         return False
-    
-    # Display results
-    success = display_results(output_file, source['name'])
-    
-    return success
+
+    return display_results(output_file, source['name'])
+
+
+def test_rocrate(source):
+    """Full test pipeline for one RO-Crate"""
+    ro_path = prepare_rocrate(source)
+    if not ro_path:
+        return False
+    return assess_rocrate(source, ro_path)
 
 
 def main():
     """Run tests on real RO-Crates"""
     print_section("FAIROs - Real World Input Tests")
     
-    # Check prerequisites
-    if not check_prerequisites():
+    # Check prerequisites (--force-check skips the 60s memo)
+    if not check_prerequisites(force="--force-check" in sys.argv):
         print("\n❌ Prerequisites not met. Please ensure F-UJI is running and network is available.")
         return 1
     
-    results = []
-    
-    # Test each RO-Crate source
-    for source in TEST_SOURCES:
-        try:
-            success = test_rocrate(source)
-            results.append((source['name'], success))
-        except Exception as e:
-            print(f"\n❌ Error testing {source['name']}: {e}")
-            results.append((source['name'], False))
-    
+    # Pipeline the two stages through a queue: a downloader pool fetches
+    # crates and hands each finished path to the assessment pool as soon
+    # as it lands, so the first assessment starts while later downloads
+    # are still in flight
+    outcome = {}
+    work = queue.Queue()
+    _done = object()  # sentinel: all downloads finished
+
+    def _produce():
+        with ThreadPoolExecutor(max_workers=min(4, len(TEST_SOURCES))) as downloaders:
+            futures = {downloaders.submit(prepare_rocrate, source): source
+                       for source in TEST_SOURCES}
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    ro_path = future.result()
+                except Exception as e:
+                    print(f"\n❌ Error downloading {source['name']}: {e}")
+                    ro_path = None
+                if ro_path:
+                    work.put((source, ro_path))
+                else:
+                    outcome[source['name']] = False
+        work.put(_done)
+
+    producer = threading.Thread(target=_produce)
+    producer.start()
+
+    with ThreadPoolExecutor(max_workers=2) as assessors:
+        futures = {}
+        while (item := work.get()) is not _done:
+            source, ro_path = item
+            futures[assessors.submit(assess_rocrate, source, ro_path)] = source
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                outcome[source['name']] = future.result()
+            except Exception as e:
+                print(f"\n❌ Error testing {source['name']}: {e}")
+                outcome[source['name']] = False
+    producer.join()
+
+    # Keep the summary in declaration order
+    results = [(source['name'], outcome[source['name']]) for source in TEST_SOURCES]
+
     # Summary
     print_section("Test Summary")
     
@@ -283,11 +655,14 @@ def main():
         if not passed:
             all_passed = False
     
-    # List output files
+    # List output files (one scandir pass; sorted for stable output)
     print(f"\n📁 Output files saved in: {FAIROS_DIR}")
-    for f in os.listdir(FAIROS_DIR):
-        if f.startswith("test_results_") and f.endswith(".json"):
-            print(f"   - {f}")
+    with os.scandir(FAIROS_DIR) as entries:
+        result_files = sorted(
+            entry.name for entry in entries
+            if entry.name.startswith("test_results_") and entry.name.endswith(".json"))
+    for name in result_files:
+        print(f"   - {name}")
     
     print("\n" + "="*70)
     if all_passed: